@@ -1,25 +1,140 @@
-from django.db.models import Model
+from collections import defaultdict, namedtuple
+from functools import lru_cache, reduce
+from operator import or_
+
+from django.db.models import Exists, Model
 from django.core.paginator import Paginator
 from django.db.models.deletion import CASCADE, SET_NULL, DO_NOTHING, PROTECT
 
+# Keyed on the on_delete handlers themselves. Functions hash and compare by identity,
+# so resolving a relation's action is a single dict lookup.
+ON_DELETE_ACTIONS = {
+    CASCADE: "delete",
+    SET_NULL: "set_null",
+    DO_NOTHING: "do_nothing",
+    PROTECT: "protect",
+}
+
+_Relation = namedtuple("_Relation", "accessor_name on_delete related_model field_name one_to_one")
+
+
+@lru_cache(maxsize=None)
+def _model_relations(model_cls):
+    """
+    Precompute the relation metadata of a model class, once per class.
+    
+    Only ForeignKey and OneToOne relations with a supported on_delete action are kept, and
+    relations whose accessor isn't available on the class are left out, so callers can use
+    the accessor names without checking them again.
+    """
+    relations = []
+    for relation in model_cls._meta.related_objects:
+        # Cheapest checks first, the accessor name is only built for relations that are kept
+        on_delete = ON_DELETE_ACTIONS.get(relation.on_delete)
+        if on_delete is None:
+            continue
+        if not (relation.one_to_many or relation.one_to_one):
+            continue
+        # Symmetrical and hidden relations have no accessor at all
+        accessor_name = relation.get_accessor_name()
+        if accessor_name is None or not hasattr(model_cls, accessor_name):
+            continue
+        relations.append(_Relation(
+            accessor_name,
+            on_delete,
+            relation.related_model,
+            relation.field.name,
+            relation.one_to_one,
+        ))
+    return tuple(relations)
+
+
+@lru_cache(maxsize=None)
+def _protected_relation(model_cls):
+    """ Return the first PROTECT relation of a model class, or None. """
+    return next((relation for relation in _model_relations(model_cls) if relation.on_delete == "protect"), None)
+
+
 class PaginatorObject:
-    """This class returns a list of objects instead of a KEY:VALUE dict to the paginator."""
+    """
+    This class returns a list of objects instead of a KEY:VALUE dict to the paginator.
+    
+    The value is kept as given, so related querysets are only evaluated when they are iterated.
+    """
+    __slots__ = ("data",)
+    
     def __init__(self, key, value):
         self.data = {key: value}
 
 
+class LenCachedQuerySet:
+    """
+    Wraps a related objects queryset and remembers its length.
+    
+    Paginators and templates can call len() or count() repeatedly without issuing a new
+    COUNT query each time, and once the queryset is evaluated its cached rows are used.
+    
+    Once the set is known to hold more than `stream_threshold` objects, iterating streams
+    them from the database in chunks of `chunk_size` instead of loading the whole set into
+    memory. Iteration never runs a COUNT query just to make that decision.
+    """
+    def __init__(self, queryset, stream_threshold=1000, chunk_size=100):
+        self.queryset = queryset
+        self.stream_threshold = stream_threshold
+        self.chunk_size = chunk_size
+        self._count = None
+    
+    def count(self):
+        if self.queryset._result_cache is not None:
+            return len(self.queryset._result_cache)
+        if self._count is None:
+            self._count = self.queryset.count()
+        return self._count
+    
+    def __len__(self):
+        return self.count()
+    
+    def __getitem__(self, item):
+        return self.queryset[item]
+    
+    def __iter__(self):
+        if self.queryset._result_cache is None and self._count is not None and self._count > self.stream_threshold:
+            return self.queryset.iterator(chunk_size=self.chunk_size)
+        return iter(self.queryset)
+    
+    def __getattr__(self, name):
+        # copy and pickle build instances without __init__, so `queryset` may not be set yet
+        if name == "queryset" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.queryset, name)
+    
+    def __repr__(self):
+        return repr(self.queryset)
+
+
 class RelatedObjectsCollector:
     """
     Collects related objects of an instance and sets the data attribute for the values.
 
     `data`: Key-Value map of the related model and the related objects queryset.
+    The querysets are lazy and only hit the database when they are iterated. They are
+    wrapped in LenCachedQuerySet, so they can be paginated without repeated COUNT queries.
     
     `paginator`: Returns a Django Paginator object. Each item in this paginator is a
     PaginatorObject wrapper that takes a model and related objects, setting them as
     key-value pairs for the data attribute.
+    
+    `related_objects`: The instance's `_meta.related_objects`, kept for callers that inspect
+    the relations. Collection itself uses metadata cached per model class.
     """
     per_page = 10
-    _related_objects = {}
+    # Maps a related model to the fields needed to display its objects, e.g. {Book: ("title",)}.
+    # Models listed here are loaded with .only() instead of selecting every column.
+    display_fields = {}
+    # Related sets known to be larger than this are streamed when iterated,
+    # fetching `stream_pages_per_chunk` pages of `per_page` objects at a time
+    stream_threshold = 1000
+    stream_pages_per_chunk = 10
     
     def __init__(self, instance: Model):
         if not isinstance(instance, Model):
@@ -31,63 +146,96 @@ class RelatedObjectsCollector:
         self.is_empty = True
         self.can_be_deleted = True
         self.reason = ''
+        self._related_objects = {}
         
-        # Collect related objects after setting the related_objects attribute
+        # Collect related objects once the instance state is initialised
         self._collect_objects()
         # Change the public data attribute after collecting the data
         self.data = self._related_objects
     
     def _collect_objects(self):
         """ Collects related objects and determines if deletion is allowed. """
-        objects = {}
-        for relation in self.related_objects:
-            # Get relation metadata
-            on_delete = self._get_on_delete_action(relation)
-            query_name = relation.get_accessor_name()
+        model_cls = type(self.instance)
+        protected_relation = _protected_relation(model_cls)
+        if protected_relation is not None:
+            self._handle_protect(protected_relation.related_model)
+            return  # Stop processing if deletion is protected, without querying the database
+        
+        objects = defaultdict(lambda: defaultdict(list))
+        relations = _model_relations(model_cls)
+        # The querysets stay unevaluated until they are iterated or sliced
+        queries = [self._get_queryset(relation) for relation in relations]
+        for relation, query, has_objects in zip(relations, queries, self._check_exists(queries)):
+            on_delete = relation.on_delete
             related_model = relation.related_model
             
-            if on_delete == 'protect':
-                self._handle_protect(related_model)
-                return  # Stop processing if deletion is protected
+            if not has_objects:
+                continue
             
-            # Collect related objects for ForeignKey, OneToOne fields with specific on_delete actions
-            if relation.one_to_many or relation.one_to_one:
-                if on_delete in {"delete", "set_null", "do_nothing", "protect"}:
-                    if hasattr(self.instance, query_name):
-                        query = list(getattr(self.instance, query_name).all())
-                        
-                        # If there are related instances with DO_NOTHING, prevent deletion
-                        if len(query) and on_delete == 'do_nothing':
-                            self._handle_do_nothing(related_model)
-                            return
-                        
-                        # Add related objects to the collection
-                        if query:
-                            if related_model not in objects:
-                                objects[related_model] = {on_delete: query}
-                            else:
-                                objects[related_model][on_delete].extend(query)
-
-        # Set the related objects and create the paginator
-        self._related_objects = objects
-        self._create_paginator([PaginatorObject(model, related_items) for model, related_items in objects.items()])
+            # If there are related instances with DO_NOTHING, prevent deletion
+            if on_delete == 'do_nothing':
+                self._handle_do_nothing(related_model)
+                return
+            
+            # Add related objects to the collection
+            objects[related_model][on_delete].append(query)
+
+        # Set the related objects and create the paginator,
+        # merging the querysets of relations to the same model with the same on_delete action
+        chunk_size = self.per_page * self.stream_pages_per_chunk
+        self._related_objects = {
+            model: {
+                on_delete: LenCachedQuerySet(self._order(reduce(or_, queries)), self.stream_threshold, chunk_size)
+                for on_delete, queries in related_objects.items()
+            }
+            for model, related_objects in objects.items()
+        }
+        self._create_paginator([PaginatorObject(model, related_items) for model, related_items in self._related_objects.items()])
         self.is_empty = len(self._related_objects.values()) == 0
 
     def _create_paginator(self, values):
         """ Generate new paginator for the related objects. """
         self.paginator = Paginator(values, self.per_page)
     
-    def _get_on_delete_action(self, relation):
-        """ Check the on_delete field from the relation object. """
-        if relation.on_delete == CASCADE:
-            return "delete"
-        elif relation.on_delete == SET_NULL:
-            return "set_null"
-        elif relation.on_delete == DO_NOTHING:
-            return "do_nothing"
-        elif relation.on_delete == PROTECT:
-            return "protect"
-        return "unknown"
+    def _order(self, queryset):
+        """ Order unordered querysets by primary key, so their pages are stable between requests. """
+        if queryset.ordered:
+            return queryset
+        return queryset.order_by("pk")
+    
+    def _check_exists(self, queries):
+        """ Check which of the querysets have objects, using a single query for all of them. """
+        if not queries:
+            return []
+        annotations = {f"related_objects_exist_{index}": Exists(query) for index, query in enumerate(queries)}
+        row = (
+            self.meta.model._base_manager.db_manager(self.instance._state.db).filter(pk=self.instance.pk)
+            .annotate(**annotations)
+            .values_list(*annotations)
+            .first()
+        )
+        return row or [False] * len(queries)
+    
+    def _get_queryset(self, relation):
+        """ Return an unevaluated queryset of the objects related through the relation. """
+        if relation.one_to_one:
+            # Reverse one-to-one accessors return an instance, not a manager.
+            # Route the queryset like the related managers do, to the instance's database.
+            manager = relation.related_model._default_manager.db_manager(hints={"instance": self.instance})
+            queryset = manager.filter(**{relation.field_name: self.instance})
+        else:
+            queryset = getattr(self.instance, relation.accessor_name).all()
+        
+        fields = self.display_fields.get(relation.related_model)
+        if fields:
+            # Keep the foreign keys back to the instance so Django doesn't reload them per object,
+            # including those of other relations to the same model that get merged into this queryset
+            foreign_keys = [
+                rel.field_name for rel in _model_relations(type(self.instance))
+                if rel.related_model is relation.related_model
+            ]
+            queryset = queryset.only("pk", *foreign_keys, *fields)
+        return queryset
     
     def _handle_protect(self, related_model):
         """ Handles the PROTECT case when deletion is not allowed. """
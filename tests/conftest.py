@@ -0,0 +1,18 @@
+import django
+from django.conf import settings
+
+
+def pytest_configure():
+    settings.configure(
+        INSTALLED_APPS=["tests"],
+        DATABASES={
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+            "other": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+        },
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+    )
+    django.setup()
+
+    from django.core.management import call_command
+    for database in settings.DATABASES:
+        call_command("migrate", run_syncdb=True, database=database, verbosity=0)
@@ -0,0 +1,42 @@
+from django.db import models
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=50)
+    friends = models.ManyToManyField("self")
+
+    def __str__(self):
+        return self.name
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=50)
+    author = models.ForeignKey(Author, models.CASCADE)
+    editor = models.ForeignKey(Author, models.CASCADE, null=True, related_name="edited_books")
+
+    def __str__(self):
+        return self.title
+
+
+class Article(models.Model):
+    author = models.ForeignKey(Author, models.SET_NULL, null=True)
+
+
+class Profile(models.Model):
+    author = models.OneToOneField(Author, models.CASCADE)
+
+
+class Note(models.Model):
+    author = models.ForeignKey(Author, models.DO_NOTHING, db_constraint=False)
+
+
+class Publisher(models.Model):
+    name = models.CharField(max_length=50)
+
+
+class Catalog(models.Model):
+    publisher = models.ForeignKey(Publisher, models.CASCADE)
+
+
+class Contract(models.Model):
+    publisher = models.ForeignKey(Publisher, models.PROTECT)
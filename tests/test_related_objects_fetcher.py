@@ -0,0 +1,169 @@
+import copy
+import pickle
+import warnings
+from unittest import mock
+
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.test import TestCase
+
+from related_objects_fetcher import RelatedObjectsCollector
+from tests.models import Article, Author, Book, Note, Profile, Publisher
+
+
+class StreamingCollector(RelatedObjectsCollector):
+    per_page = 1
+    stream_threshold = 2
+    stream_pages_per_chunk = 3
+
+
+class DisplayFieldsCollector(RelatedObjectsCollector):
+    display_fields = {Book: ("title",)}
+
+
+class RelatedObjectsCollectorTests(TestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name="author")
+        self.books = [Book.objects.create(title=f"book {i}", author=self.author) for i in range(3)]
+        # Reachable through both foreign keys, but must only be collected once
+        self.books[0].editor = self.author
+        self.books[0].save()
+        self.article = Article.objects.create(author=self.author)
+
+    def test_collects_cascade_and_set_null_objects(self):
+        collector = RelatedObjectsCollector(self.author)
+
+        self.assertTrue(collector.can_be_deleted)
+        self.assertFalse(collector.is_empty)
+        self.assertCountEqual(collector.data[Book]["delete"], self.books)
+        self.assertEqual(list(collector.data[Article]["set_null"]), [self.article])
+        self.assertEqual(collector.paginator.count, 2)
+
+    def test_collects_reverse_one_to_one(self):
+        profile = Profile.objects.create(author=self.author)
+
+        collector = RelatedObjectsCollector(self.author)
+
+        self.assertEqual(list(collector.data[Profile]["delete"]), [profile])
+
+    def test_empty_instance(self):
+        collector = RelatedObjectsCollector(Author.objects.create(name="lonely"))
+
+        self.assertTrue(collector.can_be_deleted)
+        self.assertTrue(collector.is_empty)
+        self.assertEqual(collector.data, {})
+
+    def test_do_nothing_blocks_deletion(self):
+        RelatedObjectsCollector(self.author)
+        Note.objects.create(author=self.author)
+
+        # A new collector on the same instance sees the new row
+        collector = RelatedObjectsCollector(self.author)
+
+        self.assertFalse(collector.can_be_deleted)
+        self.assertIn("DO_NOTHING", collector.reason)
+
+    def test_protect_blocks_deletion_without_queries(self):
+        publisher = Publisher.objects.create(name="publisher")
+
+        with self.assertNumQueries(0):
+            collector = RelatedObjectsCollector(publisher)
+
+        self.assertFalse(collector.can_be_deleted)
+        self.assertIn("PROTECT", collector.reason)
+
+    def test_collection_uses_a_single_query(self):
+        with self.assertNumQueries(1):
+            RelatedObjectsCollector(self.author)
+
+    def test_display_fields_load_only_the_displayed_columns(self):
+        books = DisplayFieldsCollector(self.author).data[Book]["delete"]
+
+        with self.assertNumQueries(1) as context:
+            for book in books:
+                str(book)
+                book.author
+                book.editor
+
+        self.assertEqual(
+            context.captured_queries[0]["sql"].split(" FROM ")[0],
+            'SELECT "tests_book"."id", "tests_book"."title", "tests_book"."author_id", "tests_book"."editor_id"',
+        )
+
+    def test_related_objects_are_counted_once(self):
+        books = RelatedObjectsCollector(self.author).data[Book]["delete"]
+
+        with self.assertNumQueries(1):
+            self.assertEqual(len(books), 3)
+            self.assertEqual(books.count(), 3)
+
+    def test_iteration_uses_a_single_query(self):
+        books = RelatedObjectsCollector(self.author).data[Book]["delete"]
+
+        with self.assertNumQueries(1):
+            list(books)
+
+    def test_counted_large_related_objects_are_streamed(self):
+        books = StreamingCollector(self.author).data[Book]["delete"]
+        self.assertEqual(len(books), 3)
+
+        with mock.patch.object(QuerySet, "iterator", autospec=True, side_effect=QuerySet.iterator) as iterator:
+            self.assertEqual(list(books), self.books)
+
+        iterator.assert_called_once_with(books.queryset, chunk_size=3)
+        # Streaming neither fills nor reuses the result cache
+        self.assertIsNone(books.queryset._result_cache)
+
+    def test_uncounted_related_objects_are_not_streamed(self):
+        books = StreamingCollector(self.author).data[Book]["delete"]
+
+        with mock.patch.object(QuerySet, "iterator", autospec=True, side_effect=QuerySet.iterator) as iterator:
+            with self.assertNumQueries(1):
+                self.assertEqual(list(books), self.books)
+
+        iterator.assert_not_called()
+
+    def test_merged_related_objects_paginate_in_order(self):
+        books = RelatedObjectsCollector(self.author).data[Book]["delete"]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            paginator = Paginator(books, 2)
+            pages = [list(paginator.page(number)) for number in paginator.page_range]
+
+        self.assertEqual(pages, [self.books[:2], self.books[2:]])
+
+    def test_related_objects_can_be_copied_and_pickled(self):
+        books = RelatedObjectsCollector(self.author).data[Book]["delete"]
+
+        self.assertCountEqual(copy.copy(books), self.books)
+        self.assertCountEqual(pickle.loads(pickle.dumps(books)), self.books)
+
+
+class MultipleDatabasesTests(TestCase):
+    databases = {"default", "other"}
+
+    def test_collects_from_the_instance_database(self):
+        author = Author.objects.using("other").create(name="author")
+        books = [Book.objects.using("other").create(title=f"book {i}", author=author) for i in range(3)]
+
+        collector = RelatedObjectsCollector(Author.objects.using("other").get(pk=author.pk))
+
+        self.assertFalse(collector.is_empty)
+        self.assertCountEqual(collector.data[Book]["delete"], books)
+
+    def test_collects_reverse_one_to_one_from_the_instance_database(self):
+        author = Author.objects.using("other").create(name="author")
+        profile = Profile.objects.using("other").create(author=author)
+
+        collector = RelatedObjectsCollector(author)
+
+        self.assertEqual(list(collector.data[Profile]["delete"]), [profile])
+
+    def test_do_nothing_blocks_deletion_on_the_instance_database(self):
+        author = Author.objects.using("other").create(name="author")
+        Note.objects.using("other").create(author=author)
+
+        collector = RelatedObjectsCollector(author)
+
+        self.assertFalse(collector.can_be_deleted)